@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - Portfolio Consolidation
+Rolls N per-region executive models up into a single portfolio workbook
+"""
+
+import argparse
+from multiprocessing import Pool
+from pathlib import Path
+
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+from generate_executive_excel import (
+    BLUE_ALLY_BLUE, WACC, style_header_row, format_table, npv, irr,
+    cash_flow_metrics, record_history,
+    create_executive_summary, create_platform_overview, create_roi_analysis,
+)
+from output_sinks import add_output_arguments, location, output_sink, write_all
+
+PLATFORM_KEYS = ["P0", "P1", "P2", "P3", "P4"]
+PROJECTION_YEARS = 5
+
+# Portfolio headline metrics are recomputed from the summed ROI Analysis cash
+# flows rather than averaged from each region's stated Executive Summary figures.
+CASH_FLOW_BASIS = "ROI cash flows"
+
+def empty_totals():
+    # Fixed-size accumulator: platform and cash flow totals never grow with
+    # the number of inputs; only the one-line-per-region breakdown does.
+    return {
+        "platforms": {},
+        "investment": 0.0,
+        "benefits": [0.0] * PROJECTION_YEARS,
+        "regions": [],
+    }
+
+def read_region(path):
+    """Stream one generated workbook in read-only mode and reduce it to totals."""
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        overview = wb["Platform Overview"]
+        roi = wb["ROI Analysis"]
+        platforms = {}
+        for row in overview.iter_rows(min_row=4, max_col=10, values_only=True):
+            name, description, use_cases, revenue, cost, benefit, invest = row[:7]
+            priority = row[9]
+            if name == "TOTAL":
+                break
+            if name is None:
+                continue
+            platforms[name.split(":")[0]] = [
+                name, description, use_cases or 0, revenue or 0.0, cost or 0.0,
+                benefit or 0.0, invest or 0.0, priority,
+            ]
+        cash_flows = [
+            (invest or 0.0, benefit or 0.0)
+            for invest, benefit in roi.iter_rows(
+                min_row=6, max_row=6 + PROJECTION_YEARS, min_col=2, max_col=3, values_only=True
+            )
+        ]
+    finally:
+        wb.close()
+
+    investment = -sum(invest for invest, _ in cash_flows)
+    benefits = [benefit for _, benefit in cash_flows[1:]]
+    region = (
+        Path(path).stem,
+        benefits[0],
+        investment,
+        npv(WACC, [-investment] + benefits),
+        investment / benefits[0] * 12 if benefits[0] else None,
+    )
+    return {
+        "platforms": platforms,
+        "investment": investment,
+        "benefits": benefits,
+        "regions": [region],
+    }
+
+def merge_totals(acc, part):
+    for key, values in part["platforms"].items():
+        if key not in acc["platforms"]:
+            acc["platforms"][key] = list(values)
+            continue
+        merged = acc["platforms"][key]
+        # Use Cases counts distinct use cases, the same in every region; only
+        # the money columns (revenue, cost, benefit, investment) add up.
+        merged[2] = max(merged[2], values[2])
+        for i in range(3, 7):
+            merged[i] += values[i]
+    acc["investment"] += part["investment"]
+    acc["benefits"] = [a + b for a, b in zip(acc["benefits"], part["benefits"])]
+    acc["regions"].extend(part["regions"])
+    return acc
+
+def consolidate(paths, processes=None, chunksize=8):
+    """Read every workbook in `paths` and fold the results into one totals dict.
+
+    Workbooks are opened in worker processes and reduced as they arrive, so
+    at most one workbook per worker is resident at a time.
+    """
+    totals = empty_totals()
+    if processes == 1:
+        for path in paths:
+            merge_totals(totals, read_region(path))
+    else:
+        with Pool(processes) as pool:
+            for part in pool.imap_unordered(read_region, paths, chunksize=chunksize):
+                merge_totals(totals, part)
+    totals["regions"].sort(key=lambda region: region[0])
+    return totals
+
+def portfolio_inputs(totals):
+    investment = totals["investment"]
+    benefits = totals["benefits"]
+    annual_benefit = benefits[0]
+    cash_flows = [-investment] + benefits
+    portfolio_npv = npv(WACC, cash_flows)
+    portfolio_irr = irr(cash_flows)
+    payback = investment / annual_benefit * 12 if annual_benefit else 0.0
+    pv_benefits = portfolio_npv + investment
+    pi = pv_benefits / investment if investment else 0.0
+    irr_pct = portfolio_irr * 100 if portfolio_irr is not None else 0.0
+    regions = len(totals["regions"])
+
+    overview = []
+    summary = []
+    for key in PLATFORM_KEYS:
+        if key not in totals["platforms"]:
+            continue
+        name, description, use_cases, revenue, cost, benefit, invest, priority = totals["platforms"][key]
+        roi = (benefit - invest) / invest * 100 if invest else 0.0
+        months = invest / benefit * 12 if benefit else 0.0
+        overview.append((name, description, use_cases, revenue, cost, benefit, invest, roi, months, priority))
+        share = benefit / annual_benefit if annual_benefit else 0.0
+        summary.append((name, benefit, share, invest, roi, months))
+
+    metrics = [
+        (f"{label} ({CASH_FLOW_BASIS})" if label == "Payback Period" else label, value, unit)
+        for label, value, unit in cash_flow_metrics(investment, benefits)
+    ]
+    criteria = [
+        ("NPV > 0", "PASS" if portfolio_npv > 0 else "FAIL", f"${portfolio_npv:,.1f}M portfolio NPV"),
+        ("IRR > WACC", "PASS" if irr_pct > WACC * 100 else "FAIL", f"{irr_pct:,.0f}% IRR vs {WACC:.0%} WACC"),
+        ("Payback < 12mo", "PASS" if payback < 12 else "FAIL", f"{payback:.1f} month payback ({CASH_FLOW_BASIS}) vs 12 month threshold"),
+        ("PI > 1.0", "PASS" if pi > 1 else "FAIL", f"Profitability Index = {pi:.1f}x ({CASH_FLOW_BASIS})"),
+    ]
+    recommendation = (
+        f"PORTFOLIO ROLLUP: {regions:,} regional models consolidated. Combined ${investment:,.1f}M investment "
+        f"returns ${annual_benefit:,.1f}M in Year 1 benefit, a {irr_pct:,.0f}% IRR, {payback:.1f}-month payback "
+        f"and ${portfolio_npv:,.1f}M NPV at {WACC:.0%} WACC. See Region Breakdown for per-region contribution. "
+        f"All portfolio metrics are computed from the consolidated ROI Analysis cash flows (payback = investment / "
+        f"Year 1 benefit, PI = PV of benefits / investment), so they can differ from the figures stated on each "
+        f"regional Executive Summary."
+    )
+    roi_metrics = [
+        ("Total Investment", f"${investment:,.1f}M"),
+        ("5-Year Total Benefit", f"${sum(benefits):,.1f}M"),
+        ("5-Year Net Benefit", f"${sum(benefits) - investment:,.1f}M"),
+        ("NPV (10% WACC)", f"${portfolio_npv:,.1f}M"),
+        ("IRR", f"{irr_pct:,.0f}%"),
+        ("Payback Period", f"{payback:.1f} months"),
+        ("Profitability Index", f"{pi:.1f}x"),
+    ]
+    return {
+        "metrics": metrics,
+        "summary": summary,
+        "criteria": criteria,
+        "recommendation": recommendation,
+        "overview": overview,
+        "roi_metrics": roi_metrics,
+    }
+
+def create_region_breakdown(wb, regions, annual_benefit):
+    ws = wb.create_sheet("Region Breakdown")
+    ws.sheet_properties.tabColor = "0EA5E9"
+
+    ws.merge_cells('A1:F1')
+    ws['A1'] = "PORTFOLIO BREAKDOWN BY REGION"
+    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color=BLUE_ALLY_BLUE)
+
+    headers = ["Region", "Annual Benefit", "% of Portfolio", "Investment", "5-Year NPV", f"Payback ({CASH_FLOW_BASIS})"]
+    for col, header in enumerate(headers, 1):
+        ws.cell(row=3, column=col, value=header)
+    style_header_row(ws, 3, 1, 6)
+
+    row = 4
+    for region, benefit, investment, region_npv, payback in regions:
+        ws.cell(row=row, column=1, value=region)
+        ws.cell(row=row, column=2, value=benefit).number_format = '$#,##0.0"M"'
+        ws.cell(row=row, column=3, value=benefit / annual_benefit if annual_benefit else 0).number_format = '0.0%'
+        ws.cell(row=row, column=4, value=investment).number_format = '$#,##0.0"M"'
+        ws.cell(row=row, column=5, value=region_npv).number_format = '$#,##0.0"M"'
+        ws.cell(row=row, column=6, value=payback).number_format = '0.0" mo"'
+        row += 1
+
+    # Total row
+    last = row - 1
+    ws.cell(row=row, column=1, value="TOTAL")
+    ws.cell(row=row, column=2, value=f"=SUM(B4:B{last})").number_format = '$#,##0.0"M"'
+    ws.cell(row=row, column=3, value=f"=SUM(C4:C{last})").number_format = '0.0%'
+    ws.cell(row=row, column=4, value=f"=SUM(D4:D{last})").number_format = '$#,##0.0"M"'
+    ws.cell(row=row, column=5, value=f"=SUM(E4:E{last})").number_format = '$#,##0.0"M"'
+    format_table(ws, f"A3:F{row}", totals=True)
+
+    ws.column_dimensions['A'].width = 30
+    for col in "BCDEF":
+        ws.column_dimensions[col].width = 16
+    ws.freeze_panes = 'A4'
+
+def create_portfolio_workbook(totals):
+    inputs = portfolio_inputs(totals)
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    create_executive_summary(
+        wb,
+        metrics=inputs["metrics"],
+        platforms=inputs["summary"],
+        criteria=inputs["criteria"],
+        recommendation=inputs["recommendation"],
+    )
+    create_platform_overview(wb, platforms=inputs["overview"])
+    create_roi_analysis(wb, investment=totals["investment"], benefits=totals["benefits"], metrics=inputs["roi_metrics"])
+    create_region_breakdown(wb, totals["regions"], totals["benefits"][0])
+    return wb
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidate per-region executive models into one portfolio workbook")
+    parser.add_argument("inputs", nargs="+", help="Generated .xlsx models (one per region/client)")
+    add_output_arguments(parser, "Nations_Roof_Portfolio_Model.xlsx")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--history", help="Also record the portfolio's numbers in a results history store directory")
+    parser.add_argument("--client", default="Nations Roof Portfolio", help="Client name recorded in the history store")
+    args = parser.parse_args()
+
+    totals = consolidate(args.inputs, processes=args.processes)
+    wb = create_portfolio_workbook(totals)
+    sink, name = output_sink(args)
+    result = write_all(sink, [(name, wb)])[name]
+    print(f"Consolidated {len(totals['regions'])} models into: {location(result)}")
+    if args.history:
+        # Regional models only carry platform totals, so each platform is one use-case row
+        platforms = {key: [{"name": "All use cases", "benefit": platform[5]}] for key, platform in totals["platforms"].items()}
+        record_history(args.history, args.client, cash_flow_metrics(totals["investment"], totals["benefits"]), platforms)
+
+if __name__ == "__main__":
+    main()
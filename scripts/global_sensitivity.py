@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - Global Sensitivity Analysis
+Variance-based (Sobol) sensitivity of 5-year NPV to the assumption drivers,
+using Saltelli quasi-random sampling and vectorized model evaluation
+"""
+
+import argparse
+
+import numpy as np
+from scipy.stats import qmc
+from openpyxl.chart import BarChart, Reference
+from openpyxl.styles import Font, Alignment
+
+from generate_executive_excel import (
+    BLUE_ALLY_BLUE, BLUE_ALLY_LIGHT, LIGHT_FILL, PLATFORM_OVERVIEW, PLATFORM_USE_CASES,
+    style_header_row, format_range, format_table, add_model_arguments, generate_model,
+)
+
+# Every driver is sampled uniformly over base ±20%, matching the one-at-a-time
+# range used by the tornado table on the Sensitivity Analysis sheet.
+DRIVER_RANGE = 0.20
+
+# (key, label, base value, number format)
+DRIVERS = [
+    ("leads", "New Leads", 10000, '#,##0'),
+    ("conversion_rate", "Conversion Rate", 0.12, '0.0%'),
+    ("win_rate", "Win Rate", 0.33, '0.0%'),
+    ("avg_project_value", "Average Project Value", 250000, '$#,##0'),
+    ("margin", "Project Margin", 0.35, '0.0%'),
+    ("sdr_time_saved", "SDR Time Saved", 0.40, '0.0%'),
+    ("estimator_time_saved", "Estimator Time Saved", 0.60, '0.0%'),
+    ("labor_rate", "Blended Hourly Labor Rate", 75, '$#,##0'),
+    ("maintenance_contracts", "New Maintenance Contracts", 500, '#,##0'),
+    ("marketing_reduction", "Marketing Spend Reduction", 0.15, '0.0%'),
+    ("margin_improvement", "Pricing Margin Improvement", 0.02, '0.0%'),
+    ("productivity_gain", "Sales Productivity Gain", 0.25, '0.0%'),
+    ("crew_utilization_gain", "Crew Utilization Gain", 0.15, '0.0%'),
+    ("crew_daily_rate", "Crew Daily Rate", 2500, '$#,##0'),
+    ("material_waste_reduction", "Material Waste Reduction", 0.12, '0.0%'),
+    ("incident_reduction", "Safety/Warranty Incident Reduction", 0.35, '0.0%'),
+    ("delay_days_saved", "Project Delay Days Saved", 5, '0.0'),
+    ("forecast_accuracy", "Forecast Accuracy Improvement", 0.15, '0.0%'),
+    ("discount_rate", "Discount Rate", 0.10, '0.0%'),
+    ("benefit_growth", "Benefit Growth Rate", 0.05, '0.0%'),
+    ("investment", "One-Time Investment", 5.2, '$#,##0.0"M"'),
+]
+
+# Drivers that scale each use-case benefit multiplicatively, following the
+# formulas on the platform detail sheets. Use cases not listed stay fixed.
+USE_CASE_DRIVERS = {
+    ("P0", "Revenue Growth"): ("leads", "conversion_rate", "win_rate", "avg_project_value", "margin"),
+    ("P0", "Cost Savings (SDR Labor)"): ("sdr_time_saved", "labor_rate"),
+    ("P0", "Maintenance Plan Revenue"): ("maintenance_contracts",),
+    ("P0", "Marketing Efficiency"): ("marketing_reduction",),
+    ("P0", "Lead Quality Improvement"): ("win_rate",),
+    ("P1", "Estimating Labor Savings"): ("estimator_time_saved", "labor_rate"),
+    ("P1", "Win Rate Improvement"): ("win_rate", "avg_project_value", "margin"),
+    ("P1", "Pricing Optimization"): ("margin_improvement",),
+    ("P2", "Sales Productivity"): ("productivity_gain",),
+    ("P2", "Technical Questions"): ("labor_rate",),
+    ("P2", "Proposal Generation"): ("labor_rate",),
+    ("P3", "Workforce Optimization"): ("crew_utilization_gain", "crew_daily_rate"),
+    ("P3", "Material Waste Reduction"): ("material_waste_reduction",),
+    ("P3", "Safety Incident Reduction"): ("incident_reduction",),
+    ("P3", "Project Delay Reduction"): ("delay_days_saved",),
+    ("P3", "Warranty Cost Reduction"): ("incident_reduction",),
+    ("P4", "Demand Forecasting"): ("forecast_accuracy",),
+}
+
+PROJECTION_YEARS = 5
+
+class BenefitModel:
+    """Vectorized 5-year NPV ($M) over an (n, len(DRIVERS)) array of driver values."""
+
+    def __init__(self):
+        keys = [driver[0] for driver in DRIVERS]
+        self.base = np.array([driver[2] for driver in DRIVERS], dtype=float)
+        use_cases = [(platform, uc) for platform, ucs in PLATFORM_USE_CASES.items() for uc in ucs]
+        # Use-case benefits don't add up to every platform total (P3's sum to
+        # $26.9M of $34.0M), so scale them to the Platform Overview totals the
+        # rest of the workbook is built on.
+        platform_totals = {platform[0].split(":")[0]: platform[5] for platform in PLATFORM_OVERVIEW}
+        scale = {
+            platform: platform_totals[platform] / sum(uc["benefit"] for uc in ucs)
+            for platform, ucs in PLATFORM_USE_CASES.items()
+        }
+        self.base_benefits = np.array([uc["benefit"] * scale[platform] for platform, uc in use_cases])
+        self.incidence = np.zeros((len(DRIVERS), len(use_cases)))
+        for j, (platform, uc) in enumerate(use_cases):
+            for key in USE_CASE_DRIVERS.get((platform, uc["name"]), ()):
+                self.incidence[keys.index(key), j] = 1.0
+        self.rate_idx = keys.index("discount_rate")
+        self.growth_idx = keys.index("benefit_growth")
+        self.investment_idx = keys.index("investment")
+        self.years = np.arange(1, PROJECTION_YEARS + 1)
+
+    def annual_benefit(self, x):
+        # Each use case scales by the product of its driver ratios; summing logs
+        # through the incidence matrix evaluates every use case in one matmul.
+        return np.exp(np.log(x / self.base) @ self.incidence) @ self.base_benefits
+
+    def __call__(self, x):
+        rate = x[:, self.rate_idx, None]
+        growth = x[:, self.growth_idx, None]
+        annuity = ((1 + growth) ** (self.years - 1) / (1 + rate) ** self.years).sum(axis=1)
+        return self.annual_benefit(x) * annuity - x[:, self.investment_idx]
+
+def _indices(f_a, f_b, f_ab):
+    # Saltelli (2010) first-order and Jansen total-order estimators
+    variance = np.var(np.concatenate([f_a, f_b]))
+    first = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / variance
+    return first, total
+
+def _bootstrap_indices(f_a, f_b, f_ab, n_bootstrap, rng):
+    # Each resample is a vector of draw counts, so every estimator term becomes a
+    # weighted mean and all resamples reduce to one (R, N) @ (N, terms) product.
+    n, d = f_a.shape[0], f_ab.shape[0]
+    terms = np.vstack([f_b * (f_ab - f_a), 0.5 * (f_a - f_ab) ** 2, f_a, f_b, f_a ** 2, f_b ** 2])
+    counts = np.stack([np.bincount(rng.integers(0, n, n), minlength=n) for _ in range(n_bootstrap)])
+    means = counts @ terms.T / n
+    mean_f = (means[:, 2 * d] + means[:, 2 * d + 1]) / 2
+    variance = (means[:, 2 * d + 2] + means[:, 2 * d + 3]) / 2 - mean_f ** 2
+    return means[:, :d] / variance[:, None], means[:, d:2 * d] / variance[:, None]
+
+def sobol_analysis(n=100_000, n_bootstrap=100, confidence=0.95, seed=0):
+    """Compute first- and total-order Sobol indices of NPV for every driver.
+
+    `n` is rounded up to a power of two so the scrambled Sobol sequence stays
+    balanced; the model is evaluated n * (len(DRIVERS) + 2) times. Returns a
+    dict with the ranked per-driver results and run metadata.
+    """
+    model = BenefitModel()
+    d = len(DRIVERS)
+    m = int(np.ceil(np.log2(max(n, 2))))
+    samples = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random_base2(m)
+    low, high = model.base * (1 - DRIVER_RANGE), model.base * (1 + DRIVER_RANGE)
+    a = qmc.scale(samples[:, :d], low, high)
+    b = qmc.scale(samples[:, d:], low, high)
+    del samples
+
+    f_a = model(a)
+    f_b = model(b)
+    f_ab = np.empty((d, a.shape[0]))
+    ab = a.copy()
+    for i in range(d):
+        ab[:, i] = b[:, i]
+        f_ab[i] = model(ab)
+        ab[:, i] = a[:, i]
+
+    # Centering leaves the estimators unbiased but sharply cuts their variance
+    shift = np.mean(np.concatenate([f_a, f_b]))
+    f_a -= shift
+    f_b -= shift
+    f_ab -= shift
+
+    first, total = _indices(f_a, f_b, f_ab)
+
+    boot_first, boot_total = _bootstrap_indices(f_a, f_b, f_ab, n_bootstrap, np.random.default_rng(seed))
+    tail = (1 - confidence) / 2 * 100
+    first_ci = np.percentile(boot_first, [tail, 100 - tail], axis=0)
+    total_ci = np.percentile(boot_total, [tail, 100 - tail], axis=0)
+
+    drivers = [
+        {
+            "key": key,
+            "label": label,
+            "base": base,
+            "number_format": number_format,
+            "first_order": first[i],
+            "first_order_ci": (first_ci[0, i], first_ci[1, i]),
+            "total_order": total[i],
+            "total_order_ci": (total_ci[0, i], total_ci[1, i]),
+        }
+        for i, (key, label, base, number_format) in enumerate(DRIVERS)
+    ]
+    drivers.sort(key=lambda driver: driver["total_order"], reverse=True)
+    return {
+        "drivers": drivers,
+        "base_samples": a.shape[0],
+        "evaluations": a.shape[0] * (d + 2),
+        "confidence": confidence,
+        "base_npv": float(model(model.base[None, :])[0]),
+    }
+
+def add_global_sensitivity(wb, samples=100_000, bootstrap=100, seed=0):
+    """Run the Sobol analysis and add its Global Sensitivity sheet to `wb`."""
+    results = sobol_analysis(n=samples, n_bootstrap=bootstrap, seed=seed)
+    create_global_sensitivity(wb, results)
+    return results
+
+def create_global_sensitivity(wb, results):
+    ws = wb.create_sheet("Global Sensitivity")
+    ws.sheet_properties.tabColor = "7C3AED"
+
+    ws.merge_cells('A1:H1')
+    ws['A1'] = "GLOBAL SENSITIVITY ANALYSIS (SOBOL INDICES)"
+    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color=BLUE_ALLY_BLUE)
+
+    ws.merge_cells('A2:H2')
+    ws['A2'] = (
+        f"Output: 5-year NPV of the ROI Analysis cash flows (base ${results['base_npv']:,.1f}M) | Drivers sampled uniformly over base ±{DRIVER_RANGE:.0%} | "
+        f"{results['base_samples']:,} Sobol base samples, {results['evaluations']:,} model evaluations"
+    )
+    ws['A2'].font = Font(name='Calibri', size=11, italic=True, color="666666")
+
+    ci = f"{results['confidence']:.0%} CI"
+    headers = ["Rank", "Driver", "Base Value", "First-Order (S1)", f"S1 {ci}", "Total-Order (ST)", f"ST {ci}", "Interaction (ST - S1)"]
+    for col, header in enumerate(headers, 1):
+        ws.cell(row=4, column=col, value=header)
+    style_header_row(ws, 4, 1, 8)
+
+    row = 5
+    for rank, driver in enumerate(results["drivers"], 1):
+        s1_low, s1_high = driver["first_order_ci"]
+        st_low, st_high = driver["total_order_ci"]
+        ws.cell(row=row, column=1, value=rank)
+        ws.cell(row=row, column=2, value=driver["label"])
+        ws.cell(row=row, column=3, value=driver["base"]).number_format = driver["number_format"]
+        ws.cell(row=row, column=4, value=round(float(driver["first_order"]), 4)).number_format = '0.000'
+        ws.cell(row=row, column=5, value=f"{s1_low:.3f} – {s1_high:.3f}")
+        ws.cell(row=row, column=6, value=round(float(driver["total_order"]), 4)).number_format = '0.000'
+        ws.cell(row=row, column=7, value=f"{st_low:.3f} – {st_high:.3f}")
+        ws.cell(row=row, column=8, value=f"=F{row}-D{row}").number_format = '0.000'
+        row += 1
+    last = row - 1
+    format_range(ws, f"A5:H{min(last, 7)}", fill=LIGHT_FILL, font=Font(bold=True))
+
+    ws.cell(row=row, column=2, value="TOTAL")
+    ws.cell(row=row, column=4, value=f"=SUM(D5:D{last})").number_format = '0.000'
+    format_table(ws, f"A4:H{row}", totals=True)
+
+    note_row = row + 2
+    ws.merge_cells(f'A{note_row}:H{note_row + 1}')
+    ws[f'A{note_row}'] = (
+        "S1 is the share of NPV variance explained by a driver alone; ST adds its interactions with all other drivers. "
+        "A large ST - S1 gap (e.g. Win Rate × Average Project Value) flags effects the one-at-a-time tornado cannot show."
+    )
+    ws[f'A{note_row}'].alignment = Alignment(wrap_text=True, vertical='top')
+
+    chart = BarChart()
+    chart.type = "bar"
+    chart.title = "Sobol Indices by Driver"
+    chart.y_axis.title = "Share of NPV Variance"
+    data = Reference(ws, min_col=4, max_col=4, min_row=4, max_row=last)
+    chart.add_data(data, titles_from_data=True)
+    data = Reference(ws, min_col=6, max_col=6, min_row=4, max_row=last)
+    chart.add_data(data, titles_from_data=True)
+    chart.set_categories(Reference(ws, min_col=2, min_row=5, max_row=last))
+    chart.series[0].graphicalProperties.solidFill = BLUE_ALLY_BLUE
+    chart.series[1].graphicalProperties.solidFill = BLUE_ALLY_LIGHT
+    chart.x_axis.scaling.orientation = "maxMin"
+    chart.height = 12
+    chart.width = 22
+    ws.add_chart(chart, "J4")
+
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 34
+    ws.column_dimensions['C'].width = 14
+    for col in "DEFGH":
+        ws.column_dimensions[col].width = 17
+
+def main():
+    # Same options as generate_executive_excel.py, with --global-sensitivity implied
+    parser = argparse.ArgumentParser(description="Generate the executive model with Sobol global sensitivity indices")
+    add_model_arguments(parser)
+    args = parser.parse_args()
+    args.global_sensitivity = True
+    generate_model(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - KPI Actuals Tracking
+Incrementally ingests monthly KPI logs and renders the KPI Dashboard with
+real variance-to-target values
+"""
+
+import argparse
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from generate_executive_excel import add_model_arguments, generate_model
+
+# Log rows are CSV with a header line: month (YYYY-MM), branch, kpi, value.
+# Files are append-only; each run resumes from the byte offset stored in the
+# state file, so only rows written since the last run are parsed.
+LOG_COLUMNS = ("month", "branch", "kpi", "value")
+
+# (key, dashboard label, section, baseline, target, unit, lower_is_better, aggregation)
+# "mean" reports the latest complete month averaged across branches; "ttm_sum"
+# reports the total summed across branches over the twelve calendar months
+# ending with the latest complete month, annualized while fewer are logged.
+KPI_DEFINITIONS = [
+    ("revenue", "Revenue", "financial", 250.0, 350.0, "$M", False, "ttm_sum"),
+    ("gross_margin", "Gross Margin", "financial", 32.0, 35.0, "%", False, "mean"),
+    ("operating_margin", "Operating Margin", "financial", 8.0, 12.0, "%", False, "mean"),
+    ("revenue_per_employee", "Revenue per Employee", "financial", 285.0, 350.0, "$K", False, "mean"),
+    ("customer_acquisition_cost", "Customer Acquisition Cost", "financial", 12500.0, 10000.0, "$", True, "mean"),
+    ("customer_lifetime_value", "Customer Lifetime Value", "financial", 85000.0, 100000.0, "$", False, "mean"),
+    ("bid_win_rate", "Bid Win Rate", "operational", 28.0, 35.0, "%", False, "mean"),
+    ("estimate_accuracy", "Estimate Accuracy", "operational", 85.0, 92.0, "%", False, "mean"),
+    ("on_time_delivery", "Project On-Time Delivery", "operational", 72.0, 85.0, "%", False, "mean"),
+    ("crew_utilization", "Crew Utilization", "operational", 68.0, 80.0, "%", False, "mean"),
+    ("safety_incident_rate", "Safety Incident Rate", "operational", 4.2, 3.0, "rate", True, "mean"),
+    ("customer_satisfaction", "Customer Satisfaction", "operational", 4.1, 4.5, "/5", False, "mean"),
+]
+
+KPI_KEYS = {definition[0] for definition in KPI_DEFINITIONS}
+
+DASHBOARD_HEADERS = ["KPI", "Baseline", "Target", "Actual", "As Of", "Variance to Target", "Status"]
+
+TTM_MONTHS = 12
+
+# State layout: months[kpi][YYYY-MM][branch] = [sum, count]
+STATE_VERSION = 2
+
+def empty_state():
+    return {"version": STATE_VERSION, "files": {}, "months": {}}
+
+def load_state(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"{path} was written by an older version; delete it to re-ingest the logs")
+        return state
+    return empty_state()
+
+def save_state(state, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def parse_row(fields, columns):
+    """Return (kpi, month, branch, value), or None for a KPI the dashboard doesn't track."""
+    month_idx, branch_idx, kpi_idx, value_idx = columns
+    if len(fields) <= max(columns):
+        raise ValueError(f"expected {len(LOG_COLUMNS)} columns, got {len(fields)}")
+    kpi = fields[kpi_idx].strip()
+    if kpi not in KPI_KEYS:
+        return None
+    month = fields[month_idx].strip()[:7]
+    try:
+        month = datetime.strptime(month, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise ValueError(f"month {month!r} is not YYYY-MM") from None
+    try:
+        value = float(fields[value_idx])
+    except ValueError:
+        raise ValueError(f"value {fields[value_idx].strip()!r} is not a number") from None
+    return kpi, month, fields[branch_idx].strip(), value
+
+def ingest(paths, state):
+    """Fold rows appended to each log since the last run into `state`.
+
+    Returns (rows read, rejected rows). Malformed rows are skipped and listed
+    as "file:line: reason" so one bad value can't stall later runs. A
+    trailing line without a newline is treated as still being written and is
+    left for the next run.
+    """
+    new_rows = 0
+    rejected = []
+    for path in paths:
+        key = str(Path(path).resolve())
+        entry = state["files"].setdefault(key, {"offset": 0, "line": 0, "columns": None})
+        if os.path.getsize(path) < entry["offset"]:
+            raise ValueError(f"{path} is shorter than its recorded offset; actuals logs must be append-only")
+
+        with open(path, "rb") as f:
+            f.seek(entry["offset"])
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                entry["offset"] += len(raw)
+                entry["line"] += 1
+                fields = next(csv.reader([raw.decode("utf-8", errors="replace")]), None)
+                if not fields:
+                    continue
+                if entry["columns"] is None:
+                    columns = [field.strip().lower() for field in fields]
+                    missing = [c for c in LOG_COLUMNS if c not in columns]
+                    if missing:
+                        raise ValueError(f"{path} header is missing columns: {', '.join(missing)}")
+                    entry["columns"] = [columns.index(c) for c in LOG_COLUMNS]
+                    continue
+
+                try:
+                    row = parse_row(fields, entry["columns"])
+                except ValueError as e:
+                    rejected.append(f"{path}:{entry['line']}: {e}")
+                    continue
+                if row is None:
+                    continue
+                kpi, month, branch, value = row
+                totals = state["months"].setdefault(kpi, {}).setdefault(month, {}).setdefault(branch, [0.0, 0])
+                totals[0] += value
+                totals[1] += 1
+                new_rows += 1
+    return new_rows, rejected
+
+def latest_complete_month(months):
+    # A month is complete once every branch that reported the KPI the month
+    # before has reported it too; the first logged month is complete as-is.
+    ordered = sorted(months)
+    for i in reversed(range(len(ordered))):
+        if i == 0 or set(months[ordered[i - 1]]) <= set(months[ordered[i]]):
+            return ordered[i]
+    return None
+
+def month_offset(month, delta):
+    year, month = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + delta, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+def actual_value(months, aggregation):
+    """Return (actual, as-of label) for one KPI's monthly per-branch totals."""
+    latest = latest_complete_month(months)
+    if latest is None:
+        return None, None
+    if aggregation == "ttm_sum":
+        first = month_offset(latest, 1 - TTM_MONTHS)
+        window = [m for m in months if first <= m <= latest]
+        total = sum(branch[0] for m in window for branch in months[m].values())
+        if len(window) < TTM_MONTHS:
+            return total / len(window) * TTM_MONTHS, f"{min(window)} to {latest} ({len(window)} mo annualized)"
+        return total, f"{first} to {latest}"
+    total = sum(branch[0] for branch in months[latest].values())
+    count = sum(branch[1] for branch in months[latest].values())
+    return total / count, latest
+
+def format_value(value, unit):
+    if value is None:
+        return "—"
+    if unit == "$M":
+        return f"${value:,.1f}M"
+    if unit == "$K":
+        return f"${value:,.0f}K"
+    if unit == "$":
+        return f"${value:,.0f}"
+    if unit == "%":
+        return f"{value:.1f}%"
+    if unit == "/5":
+        return f"{value:.1f}/5"
+    return f"{value:.1f}"
+
+def format_variance(actual, target, unit):
+    if actual is None:
+        return "—"
+    if unit == "%":
+        return f"{actual - target:+.1f}pp"
+    if unit == "/5":
+        return f"{actual - target:+.1f}"
+    return f"{(actual - target) / target:+.1%}"
+
+def kpi_status(actual, baseline, target, lower_is_better):
+    if actual is None:
+        return "No Data"
+    sign = -1 if lower_is_better else 1
+    if sign * (actual - target) >= 0:
+        return "Exceeds"
+    if sign * (actual - baseline) > 0:
+        return "Improving"
+    return "Below Target"
+
+def branches(state):
+    return sorted({branch for months in state["months"].values() for totals in months.values() for branch in totals})
+
+def dashboard_rows(state, branch=None):
+    """Build `create_kpi_dashboard` keyword arguments from ingested actuals, optionally for one branch."""
+    sections = {"financial": [], "operational": []}
+    for key, label, section, baseline, target, unit, lower_is_better, aggregation in KPI_DEFINITIONS:
+        months = state["months"].get(key, {})
+        if branch is not None:
+            months = {month: {branch: totals[branch]} for month, totals in months.items() if branch in totals}
+        actual, as_of = actual_value(months, aggregation)
+        sections[section].append((
+            label,
+            format_value(baseline, unit),
+            format_value(target, unit),
+            format_value(actual, unit),
+            as_of or "—",
+            format_variance(actual, target, unit),
+            kpi_status(actual, baseline, target, lower_is_better),
+        ))
+    return {
+        "headers": DASHBOARD_HEADERS,
+        "financial_kpis": sections["financial"],
+        "operational_kpis": sections["operational"],
+    }
+
+def update_state(logs, state_path):
+    """Ingest new rows from `logs` into the state file and return the updated state."""
+    state = load_state(state_path)
+    new_rows, rejected = ingest(logs, state)
+    save_state(state, state_path)
+    for message in rejected:
+        print(f"Skipped {message}")
+    print(f"Ingested {new_rows:,} new KPI rows ({len(rejected):,} skipped)")
+    return state
+
+def main():
+    # Same options as generate_executive_excel.py, with the logs as --kpi-logs
+    parser = argparse.ArgumentParser(description="Ingest KPI actuals and regenerate the executive model")
+    parser.add_argument("logs", nargs="+", help="Append-only monthly KPI logs (CSV)")
+    add_model_arguments(parser)
+    args = parser.parse_args()
+    args.kpi_logs = args.logs
+    generate_model(args)
+
+if __name__ == "__main__":
+    main()
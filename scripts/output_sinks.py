@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - Output Sinks
+Destinations for generated workbooks: a local directory, in-memory buffers,
+or an object store, with bounded-concurrency batch writes and retry
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from io import BytesIO
+from pathlib import Path
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def normalize_key(rel_key):
+    # Same rule as normalizeKey in server/storage.ts
+    return rel_key.lstrip("/")
+
+class LocalDirectorySink:
+    """Writes each workbook straight into `directory`; returns the file path."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, name, wb):
+        path = self.directory / name
+        # openpyxl streams the zip into any binary file object
+        with open(path, "wb") as f:
+            wb.save(f)
+        return path
+
+class MemorySink:
+    """Keeps each workbook as a BytesIO, returned to the caller and kept in `outputs`."""
+
+    def __init__(self):
+        self.outputs = {}
+
+    def write(self, name, wb):
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        self.outputs[name] = buffer
+        return buffer
+
+class LocalObjectStore:
+    """Filesystem stand-in for the storage proxy behind server/storage.ts.
+
+    `put` and `get` mirror storagePut/storageGet: keys are normalized the same
+    way and both return {"key", "url"}.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def put(self, rel_key, data, content_type="application/octet-stream"):
+        key = normalize_key(rel_key)
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return {"key": key, "url": path.resolve().as_uri()}
+
+    def get(self, rel_key):
+        key = normalize_key(rel_key)
+        return {"key": key, "url": (self.root / key).resolve().as_uri()}
+
+class ObjectStoreSink:
+    """Uploads each workbook under `prefix` to any store exposing put(key, data, content_type)."""
+
+    def __init__(self, store, prefix=""):
+        self.store = store
+        self.prefix = prefix.strip("/")
+
+    def write(self, name, wb):
+        buffer = BytesIO()
+        wb.save(buffer)
+        key = f"{self.prefix}/{name}" if self.prefix else name
+        # getbuffer() is a view of the saved zip, not a second copy of it
+        return self.store.put(key, buffer.getbuffer(), XLSX_CONTENT_TYPE)
+
+def write_with_retry(sink, name, wb, retries=3, backoff=0.5, retry_on=(OSError,)):
+    for attempt in range(retries + 1):
+        try:
+            return sink.write(name, wb)
+        except retry_on:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+def write_all(sink, items, max_workers=4, retries=3, backoff=0.5, retry_on=(OSError,)):
+    """Write (name, workbook) pairs to `sink` concurrently.
+
+    At most `max_workers` writes run at once and at most twice that many
+    workbooks are held pending, so a lazily generated batch is never fully
+    materialized. Failed writes are retried with exponential backoff; the
+    first error that survives its retries is raised. Returns {name: result}.
+    """
+    results = {}
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def drain(return_when):
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+
+        for name, wb in items:
+            if len(pending) >= max_workers * 2:
+                drain(FIRST_COMPLETED)
+            future = executor.submit(write_with_retry, sink, name, wb, retries, backoff, retry_on)
+            pending[future] = name
+        if pending:
+            drain(ALL_COMPLETED)
+    return results
+
+def location(result):
+    """Printable location of a sink write result: a file path, or an object store's URL."""
+    return result["url"] if isinstance(result, dict) else result
+
+def add_output_arguments(parser, default_output):
+    parser.add_argument("-o", "--output", default=default_output, help="Workbook path, or object key with --object-store")
+    parser.add_argument("--object-store", help="Upload to a local object-store root instead of writing --output")
+    parser.add_argument("--prefix", default="", help="Object-store key prefix")
+
+def output_sink(args):
+    """Return (sink, name) for the arguments added by add_output_arguments."""
+    path = Path(args.output)
+    if args.object_store:
+        return ObjectStoreSink(LocalObjectStore(args.object_store), args.prefix), path.name
+    return LocalDirectorySink(path.parent), path.name
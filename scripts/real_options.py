@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - Staged Investment Real Options
+Values the phased P0-P4 rollout as a sequence of go/no-go decisions on a
+binomial lattice and reports option value and the optimal staging policy
+"""
+
+import argparse
+
+import numpy as np
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, Alignment
+
+from generate_executive_excel import (
+    BLUE_ALLY_BLUE, SUCCESS_FILL, WACC, PLATFORM_OVERVIEW,
+    subheader_font, currency_font, style_header_row, format_table, add_model_arguments, generate_model,
+)
+
+BENEFIT_GROWTH = 0.05
+PROJECTION_YEARS = 5
+
+# One platform goes live per quarter starting Q1: P0 is decided now, P4 in a year.
+PHASE_SPACING = 0.25
+
+DEFAULT_VOLATILITY = 0.40
+DEFAULT_RISK_FREE = 0.045
+DEFAULT_STEPS_PER_PHASE = 250
+
+def benefit_annuity():
+    # PV at WACC of $1 of annual benefit growing at BENEFIT_GROWTH for the projection
+    years = np.arange(1, PROJECTION_YEARS + 1)
+    return float(((1 + BENEFIT_GROWTH) ** (years - 1) / (1 + WACC) ** years).sum())
+
+def rollout_phases(platforms=None):
+    """Return (name, decision time in years, investment $M, benefit PV $M) per phase."""
+    annuity = benefit_annuity()
+    phases = []
+    for k, platform in enumerate(platforms or PLATFORM_OVERVIEW):
+        name, benefit, investment = platform[0], platform[5], platform[6]
+        phases.append((name, k * PHASE_SPACING, investment, benefit * annuity))
+    return phases
+
+def staged_option_value(phases, volatility=DEFAULT_VOLATILITY, risk_free=DEFAULT_RISK_FREE,
+                        steps_per_phase=DEFAULT_STEPS_PER_PHASE):
+    """Value the rollout with a go/no-go decision before each phase.
+
+    All phases share one CRR lattice on the program's benefit PV. A no-go
+    abandons every later phase, so the value at decision k is
+    max(0, phase payoff + value of the remaining decisions). The benefit a
+    phase forgoes while it waits enters as a continuous payout yield.
+    Backward induction works on whole node arrays, so cost is
+    O(total_steps^2) vector work regardless of lattice depth.
+    """
+    s0 = sum(phase[3] for phase in phases)
+    payout_yield = 1 / benefit_annuity()
+    shares = np.array([phase[3] / s0 for phase in phases])
+    investments = np.array([phase[2] for phase in phases])
+    decision_steps = [round(phase[1] / PHASE_SPACING * steps_per_phase) for phase in phases]
+
+    dt = PHASE_SPACING / steps_per_phase
+    up = np.exp(volatility * np.sqrt(dt))
+    down = 1 / up
+    p = (np.exp((risk_free - payout_yield) * dt) - down) / (up - down)
+    if not 0 < p < 1:
+        raise ValueError("Lattice is not arbitrage-free; increase steps_per_phase or volatility")
+    discount = np.exp(-risk_free * dt)
+
+    def node_values(step):
+        ups = np.arange(step + 1)
+        return s0 * up ** ups * down ** (step - ups)
+
+    # Backward induction from the last decision date
+    values = np.zeros(decision_steps[-1] + 1)
+    step = decision_steps[-1]
+    go_masks = [None] * len(phases)
+    thresholds = [None] * len(phases)
+    for k in reversed(range(len(phases))):
+        while step > decision_steps[k]:
+            values = discount * (p * values[1:] + (1 - p) * values[:-1])
+            step -= 1
+        s = node_values(step)
+        proceed = shares[k] * s - investments[k] + values
+        go = proceed > 0
+        values = np.where(go, proceed, 0.0)
+        go_masks[k] = go
+        if go.all():
+            thresholds[k] = "Always"
+        elif not go.any():
+            thresholds[k] = "Never"
+        else:
+            thresholds[k] = float(shares[k] * s[go].min())
+    flexible_value = float(values[0])
+
+    # Forward pass: risk-neutral probability of reaching and approving each phase
+    probabilities = []
+    mass = np.ones(1)
+    step = 0
+    for k in range(len(phases)):
+        while step < decision_steps[k]:
+            advanced = np.zeros(step + 2)
+            advanced[:-1] += (1 - p) * mass
+            advanced[1:] += p * mass
+            mass = advanced
+            step += 1
+        mass = np.where(go_masks[k], mass, 0.0)
+        probabilities.append(float(mass.sum()))
+
+    times = np.array([phase[1] for phase in phases])
+    committed_value = float((shares * s0 * np.exp(-payout_yield * times) - investments * np.exp(-risk_free * times)).sum())
+    lump_sum_value = float(s0 - investments.sum())
+    return {
+        "phases": [
+            {
+                "name": name,
+                "time": time,
+                "investment": investment,
+                "benefit_pv": benefit_pv,
+                "threshold": thresholds[k],
+                "probability": probabilities[k],
+            }
+            for k, (name, time, investment, benefit_pv) in enumerate(phases)
+        ],
+        "flexible_value": flexible_value,
+        "committed_value": committed_value,
+        "lump_sum_value": lump_sum_value,
+        "option_value": max(flexible_value - committed_value, 0.0),
+        "volatility": volatility,
+        "risk_free": risk_free,
+        "payout_yield": payout_yield,
+        "steps": decision_steps[-1],
+    }
+
+def add_real_options(wb, volatility=DEFAULT_VOLATILITY, risk_free=DEFAULT_RISK_FREE,
+                     steps_per_phase=DEFAULT_STEPS_PER_PHASE):
+    """Value the base-case rollout and add its Real Options sheet to `wb`."""
+    results = staged_option_value(rollout_phases(), volatility, risk_free, steps_per_phase)
+    create_real_options(wb, results)
+    return results
+
+def create_real_options(wb, results):
+    ws = wb.create_sheet("Real Options")
+    ws.sheet_properties.tabColor = "0F766E"
+
+    ws.merge_cells('A1:G1')
+    ws['A1'] = "STAGED INVESTMENT - REAL OPTIONS VALUATION"
+    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color=BLUE_ALLY_BLUE)
+
+    # Valuation Summary
+    ws['A3'] = "VALUATION SUMMARY"
+    ws['A3'].font = Font(name='Calibri', size=14, bold=True, color=BLUE_ALLY_BLUE)
+
+    summary = [
+        ("Up-Front Lump Sum NPV", results["lump_sum_value"]),
+        ("Committed Phased Rollout NPV", results["committed_value"]),
+        ("Flexible Phased Rollout NPV", results["flexible_value"]),
+        ("Value of Go/No-Go Flexibility", results["option_value"]),
+    ]
+    row = 5
+    for metric, value in summary:
+        ws.cell(row=row, column=1, value=metric).font = subheader_font
+        cell = ws.cell(row=row, column=2, value=round(value, 2))
+        cell.number_format = '$#,##0.00"M"'
+        cell.font = currency_font
+        row += 1
+
+    # Lattice Inputs
+    ws['D3'] = "LATTICE INPUTS"
+    ws['D3'].font = Font(name='Calibri', size=14, bold=True, color=BLUE_ALLY_BLUE)
+    inputs = [
+        ("Benefit Volatility", results["volatility"], '0.0%'),
+        ("Risk-Free Rate", results["risk_free"], '0.0%'),
+        ("Benefit Payout Yield", results["payout_yield"], '0.0%'),
+        ("Lattice Steps", results["steps"], '#,##0'),
+    ]
+    row = 5
+    for label, value, number_format in inputs:
+        ws.cell(row=row, column=4, value=label).font = subheader_font
+        ws.cell(row=row, column=5, value=value).number_format = number_format
+        row += 1
+
+    # Optimal Staging Policy
+    ws['A11'] = "OPTIMAL STAGING POLICY"
+    ws['A11'].font = Font(name='Calibri', size=14, bold=True, color=BLUE_ALLY_BLUE)
+
+    headers = ["Phase", "Decision Point", "Investment", "Benefit PV (Today)", "Static NPV", "Go If Phase PV ≥", "Prob. of Proceeding"]
+    for col, header in enumerate(headers, 1):
+        ws.cell(row=13, column=col, value=header)
+    style_header_row(ws, 13, 1, 7)
+
+    row = 14
+    for k, phase in enumerate(results["phases"]):
+        ws.cell(row=row, column=1, value=phase["name"])
+        ws.cell(row=row, column=2, value=f"Q{k + 1} (t = {phase['time']:.2f} yr)")
+        ws.cell(row=row, column=3, value=phase["investment"]).number_format = '$#,##0.0"M"'
+        ws.cell(row=row, column=4, value=round(phase["benefit_pv"], 2)).number_format = '$#,##0.0"M"'
+        ws.cell(row=row, column=5, value=f"=D{row}-C{row}").number_format = '$#,##0.0"M"'
+        threshold = phase["threshold"]
+        if isinstance(threshold, float):
+            threshold = round(threshold, 2)
+        ws.cell(row=row, column=6, value=threshold).number_format = '$#,##0.00"M"'
+        ws.cell(row=row, column=7, value=round(phase["probability"], 4)).number_format = '0.0%'
+        row += 1
+    ws.conditional_formatting.add(
+        f"G14:G{row - 1}", CellIsRule(operator="greaterThanOrEqual", formula=["0.99"], fill=SUCCESS_FILL)
+    )
+
+    ws.cell(row=row, column=1, value="TOTAL")
+    ws.cell(row=row, column=3, value=f"=SUM(C14:C{row - 1})").number_format = '$#,##0.0"M"'
+    ws.cell(row=row, column=4, value=f"=SUM(D14:D{row - 1})").number_format = '$#,##0.0"M"'
+    ws.cell(row=row, column=5, value=f"=SUM(E14:E{row - 1})").number_format = '$#,##0.0"M"'
+    format_table(ws, f"A13:G{row}", totals=True)
+
+    note_row = row + 2
+    ws.merge_cells(f'A{note_row}:G{note_row + 2}')
+    ws[f'A{note_row}'] = (
+        "Each phase is approved at its decision point only if the phase's benefit PV, plus the option to continue "
+        "with later phases, exceeds its investment; a no-go stops the rollout. The flexibility value is the "
+        "flexible rollout NPV less the NPV of committing to every phase on the same schedule."
+    )
+    ws[f'A{note_row}'].alignment = Alignment(wrap_text=True, vertical='top')
+
+    ws.column_dimensions['A'].width = 32
+    ws.column_dimensions['B'].width = 18
+    ws.column_dimensions['C'].width = 14
+    ws.column_dimensions['D'].width = 22
+    ws.column_dimensions['E'].width = 14
+    ws.column_dimensions['F'].width = 18
+    ws.column_dimensions['G'].width = 18
+
+def main():
+    # Same options as generate_executive_excel.py, with --real-options implied
+    parser = argparse.ArgumentParser(description="Generate the executive model with the staged-investment Real Options sheet")
+    add_model_arguments(parser)
+    args = parser.parse_args()
+    args.real_options = True
+    generate_model(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Nations Roof AI Transformation - Results History Store
+Append-only columnar store of every generated model, memory-mapped for
+fast cross-run queries without reopening any workbook
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Each table is a directory holding one raw little-endian file per column.
+# String columns are stored as int32 codes into dictionaries.json.
+SCHEMAS = {
+    "runs": [
+        ("run_id", "<i8"),
+        ("timestamp", "<i8"),
+        ("client", "<i4"),
+        ("total_benefit", "<f8"),
+        ("investment", "<f8"),
+        ("year1_roi", "<f8"),
+        ("payback_months", "<f8"),
+        ("npv", "<f8"),
+        ("irr", "<f8"),
+    ],
+    "use_cases": [
+        ("run_id", "<i8"),
+        ("timestamp", "<i8"),
+        ("client", "<i4"),
+        ("platform", "<i4"),
+        ("use_case", "<i4"),
+        ("benefit", "<f8"),
+    ],
+}
+
+DICTIONARY_COLUMNS = ("client", "platform", "use_case")
+
+# Executive Summary metric label -> runs column
+RUN_METRICS = {
+    "Total Annual Benefit": "total_benefit",
+    "One-Time Investment": "investment",
+    "Year 1 ROI": "year1_roi",
+    "Payback Period": "payback_months",
+    "5-Year NPV (10% WACC)": "npv",
+    "Internal Rate of Return": "irr",
+}
+
+AGGREGATES = ("sum", "mean", "min", "max", "count")
+
+# Group-by spans up to this many key combinations are reduced with a dense bincount
+DENSE_GROUP_LIMIT = 1 << 24
+
+class ResultsStore:
+    """Columnar history of generated models rooted at `path`.
+
+    Appends write every column file first and then atomically replace
+    meta.json with the new row counts, so readers only ever see whole runs
+    and a crash mid-append is trimmed away by the next writer. Writers
+    serialize on an exclusive lock file, so concurrent runs can share a store.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        for table in SCHEMAS:
+            (self.path / table).mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        self.meta = self._read_json("meta.json", {"rows": {table: 0 for table in SCHEMAS}, "next_run_id": 1})
+        self.dictionaries = self._read_json("dictionaries.json", {column: [] for column in DICTIONARY_COLUMNS})
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self.dictionaries.items()
+        }
+
+    @contextmanager
+    def _writer_lock(self):
+        with open(self.path / "writer.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Pick up runs other writers committed since this store was opened
+                self._load()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_json(self, name, default):
+        path = self.path / name
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)
+        return default
+
+    def _write_json(self, name, data):
+        tmp_path = self.path / f"{name}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path / name)
+
+    def _encode(self, column, value):
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return codes[value]
+
+    def _append(self, table, columns):
+        committed = self.meta["rows"][table]
+        for name, dtype in SCHEMAS[table]:
+            path = self.path / table / f"{name}.bin"
+            with open(path, "ab") as f:
+                f.truncate(committed * np.dtype(dtype).itemsize)
+                f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+        self.meta["rows"][table] = committed + len(columns["run_id"])
+
+    def append_run(self, client, metrics, platform_use_cases, timestamp=None):
+        """Record one generated model and return its run id.
+
+        `metrics` is an Executive Summary list of (label, value, unit) and
+        `platform_use_cases` maps platform key to its use-case dicts, i.e. the
+        same inputs the workbook builders take.
+        """
+        with self._writer_lock():
+            run_id = self.meta["next_run_id"]
+            timestamp = int(timestamp if timestamp is not None else time.time())
+            client_code = self._encode("client", client)
+
+            values = {column: np.nan for column in RUN_METRICS.values()}
+            for label, value, _ in metrics:
+                if label in RUN_METRICS:
+                    values[RUN_METRICS[label]] = value
+            self._append("runs", {
+                "run_id": [run_id],
+                "timestamp": [timestamp],
+                "client": [client_code],
+                **{column: [value] for column, value in values.items()},
+            })
+
+            rows = [
+                (self._encode("platform", platform), self._encode("use_case", uc["name"]), uc["benefit"])
+                for platform, use_cases in platform_use_cases.items()
+                for uc in use_cases
+            ]
+            self._append("use_cases", {
+                "run_id": [run_id] * len(rows),
+                "timestamp": [timestamp] * len(rows),
+                "client": [client_code] * len(rows),
+                "platform": [row[0] for row in rows],
+                "use_case": [row[1] for row in rows],
+                "benefit": [row[2] for row in rows],
+            })
+
+            self.meta["next_run_id"] = run_id + 1
+            self._write_json("dictionaries.json", self.dictionaries)
+            self._write_json("meta.json", self.meta)
+            return run_id
+
+    def _check_table(self, table):
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(SCHEMAS)}")
+
+    def _check_column(self, table, name):
+        self._check_table(table)
+        if name not in dict(SCHEMAS[table]):
+            raise ValueError(f"Table {table!r} has no {name!r} column")
+
+    def column(self, table, name):
+        """Memory-map one committed column; no data is read until it is touched."""
+        self._check_column(table, name)
+        rows = self.meta["rows"][table]
+        dtype = dict(SCHEMAS[table])[name]
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path / table / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+
+    def _mask(self, table, client=None, platform=None, start=None, end=None):
+        self._check_table(table)
+        mask = np.ones(self.meta["rows"][table], dtype=bool)
+        for name, value in (("client", client), ("platform", platform)):
+            if value is not None:
+                self._check_column(table, name)
+                code = self._codes[name].get(value)
+                if code is None:
+                    return np.zeros_like(mask)
+                mask &= self.column(table, name) == code
+        if start is not None or end is not None:
+            timestamps = self.column(table, "timestamp")
+            if start is not None:
+                mask &= timestamps >= _epoch(start)
+            if end is not None:
+                mask &= timestamps < _epoch(end)
+        return mask
+
+    def select(self, table, columns=None, **filters):
+        """Return {column: array} for rows matching client/platform/start/end filters."""
+        mask = self._mask(table, **filters)
+        names = columns or [name for name, _ in SCHEMAS[table]]
+        return {name: self._decode(name, np.asarray(self.column(table, name)[mask])) for name in names}
+
+    def aggregate(self, table, value, by=(), agg="mean", **filters):
+        """Group `value` by the `by` columns and reduce with `agg`.
+
+        Returns a list of (group key tuple, aggregate) sorted by key.
+        """
+        if agg not in AGGREGATES:
+            raise ValueError(f"agg must be one of {', '.join(AGGREGATES)}")
+        mask = self._mask(table, **filters)
+        values = np.asarray(self.column(table, value)[mask], dtype=float)
+        if not by:
+            return [((), _reduce(values, agg))] if values.size else []
+
+        # Fold the group columns into one mixed-radix integer key so grouping is
+        # a single bincount over the rows instead of a multi-column sort.
+        codes, sizes, offsets = [], [], []
+        for name in by:
+            key = np.asarray(self._group_key(table, name)[mask], dtype=np.int64)
+            low = int(key.min()) if key.size else 0
+            key = key - low
+            codes.append(key)
+            sizes.append(int(key.max()) + 1 if key.size else 1)
+            offsets.append(low)
+        composite = np.ravel_multi_index(codes, sizes) if codes[0].size else np.empty(0, dtype=np.int64)
+        span = int(np.prod(sizes))
+        if span <= DENSE_GROUP_LIMIT:
+            counts = np.bincount(composite, minlength=span)
+            groups = np.flatnonzero(counts)
+            inverse = composite
+        else:
+            groups, inverse = np.unique(composite, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(groups))
+        slots = len(counts)
+
+        if agg == "count":
+            results = counts.astype(float)
+        elif agg in ("sum", "mean"):
+            results = np.bincount(inverse, weights=values, minlength=slots)
+            if agg == "mean":
+                results = results / np.maximum(counts, 1)
+        else:
+            results = np.full(slots, np.inf if agg == "min" else -np.inf)
+            (np.minimum if agg == "min" else np.maximum).at(results, inverse, values)
+        if span <= DENSE_GROUP_LIMIT:
+            results = results[groups]
+
+        group_codes = np.unravel_index(groups, sizes)
+        decoded = [
+            self._decode(name, group_codes[i] + offsets[i])
+            for i, name in enumerate(by)
+        ]
+        return sorted(
+            (tuple(column[i] for column in decoded), float(results[i]))
+            for i in range(len(groups))
+        )
+
+    def trend(self, metric, freq="M", client=None, agg="mean", start=None, end=None):
+        """Aggregate a runs metric (e.g. "npv") per client and calendar period.
+
+        `freq` is a NumPy datetime unit: "D", "W", "M", "Y".
+        """
+        return self.aggregate("runs", metric, by=(f"period:{freq}", "client"), agg=agg,
+                              client=client, start=start, end=end)
+
+    def _group_key(self, table, name):
+        if name.startswith("period:"):
+            unit = name.split(":", 1)[1]
+            periods = self.column(table, "timestamp").astype("datetime64[s]").astype(f"datetime64[{unit}]")
+            return periods.astype(np.int64)
+        return self.column(table, name)
+
+    def _decode(self, name, values):
+        if name in DICTIONARY_COLUMNS:
+            lookup = np.array(self.dictionaries[name] or [""], dtype=object)
+            return lookup[values]
+        if name.startswith("period:"):
+            unit = name.split(":", 1)[1]
+            return np.datetime_as_string(values.astype(f"datetime64[{unit}]")).tolist()
+        return values
+
+def _epoch(value):
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+def _reduce(values, agg):
+    if agg == "count":
+        return float(values.size)
+    return float(getattr(np, agg)(values))
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the generated-model history store")
+    parser.add_argument("store", help="History store directory")
+    parser.add_argument("metric", help="runs column to trend, e.g. npv, irr, total_benefit")
+    parser.add_argument("--client")
+    parser.add_argument("--freq", default="M", help="Period unit: D, W, M or Y")
+    parser.add_argument("--agg", default="mean", choices=AGGREGATES)
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    rows = store.trend(args.metric, freq=args.freq, client=args.client, agg=args.agg, start=args.start, end=args.end)
+    for (period, client), value in rows:
+        print(f"{period}\t{client}\t{value:,.2f}")
+
+if __name__ == "__main__":
+    main()
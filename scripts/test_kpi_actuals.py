@@ -0,0 +1,157 @@
+import pytest
+
+from kpi_actuals import (
+    actual_value, branches, dashboard_rows, empty_state, ingest, latest_complete_month, load_state, save_state,
+)
+
+HEADER = "month,branch,kpi,value\n"
+
+def write(path, text, mode="w"):
+    with open(path, mode) as f:
+        f.write(text)
+
+def branch_totals(state, kpi, month):
+    return state["months"][kpi][month]
+
+def test_resumes_from_stored_offset(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + "2026-01,North,gross_margin,33\n2026-01,South,gross_margin,35\n")
+    state = empty_state()
+    assert ingest([log], state) == (2, [])
+
+    write(log, "2026-01,North,gross_margin,31\n", mode="a")
+    assert ingest([log], state) == (1, [])
+    assert branch_totals(state, "gross_margin", "2026-01") == {"North": [64.0, 2], "South": [35.0, 1]}
+    assert ingest([log], state) == (0, [])
+
+def test_state_round_trips_through_file(tmp_path):
+    log = tmp_path / "actuals.csv"
+    state_path = tmp_path / "state.json"
+    write(log, HEADER + "2026-01,North,revenue,16.5\n")
+    state = empty_state()
+    ingest([log], state)
+    save_state(state, state_path)
+
+    write(log, "2026-01,South,revenue,16.5\n", mode="a")
+    state = load_state(state_path)
+    assert ingest([log], state) == (1, [])
+    assert set(branch_totals(state, "revenue", "2026-01")) == {"North", "South"}
+
+def test_rejects_state_from_older_version(tmp_path):
+    state_path = tmp_path / "state.json"
+    write(state_path, '{"files": {}, "months": {}}')
+    with pytest.raises(ValueError, match="older version"):
+        load_state(state_path)
+
+def test_partial_trailing_line_waits_for_next_run(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + "2026-01,North,bid_win_rate,3")
+    state = empty_state()
+    assert ingest([log], state) == (0, [])
+
+    write(log, "5\n", mode="a")
+    assert ingest([log], state) == (1, [])
+    assert branch_totals(state, "bid_win_rate", "2026-01") == {"North": [35.0, 1]}
+
+def test_truncated_log_is_an_error(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + "2026-01,North,bid_win_rate,35\n")
+    state = empty_state()
+    ingest([log], state)
+
+    write(log, HEADER)
+    with pytest.raises(ValueError, match="append-only"):
+        ingest([log], state)
+
+def test_bad_rows_are_skipped_and_reported(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + (
+        "2026-02,North,gross_margin,abc\n"
+        "2026-02,North,gross_margin\n"
+        "2026-13,North,gross_margin,30\n"
+        "2026-02,North,gross_margin,36\n"
+    ))
+    state = empty_state()
+    new_rows, rejected = ingest([log], state)
+
+    assert new_rows == 1
+    assert [message.split(": ")[0] for message in rejected] == [f"{log}:2", f"{log}:3", f"{log}:4"]
+    assert "'abc' is not a number" in rejected[0]
+    assert branch_totals(state, "gross_margin", "2026-02") == {"North": [36.0, 1]}
+    # The bad rows are behind the stored offset, so they are not reported again
+    assert ingest([log], state) == (0, [])
+
+def test_latest_complete_month_waits_for_missing_branch():
+    months = {
+        "2026-01": {"North": [35.0, 1], "South": [35.0, 1]},
+        "2026-02": {"North": [20.0, 1]},
+    }
+    assert latest_complete_month(months) == "2026-01"
+
+    months["2026-02"]["South"] = [36.0, 1]
+    assert latest_complete_month(months) == "2026-02"
+    assert latest_complete_month({}) is None
+
+def test_partial_ttm_is_annualized():
+    months = {
+        "2026-01": {"North": [16.5, 1], "South": [16.5, 1]},
+        "2026-02": {"North": [16.5, 1], "South": [16.5, 1]},
+    }
+    actual, as_of = actual_value(months, "ttm_sum")
+    assert actual == pytest.approx(396.0)
+    assert as_of == "2026-01 to 2026-02 (2 mo annualized)"
+
+def test_ttm_window_is_calendar_based():
+    # Fourteen months logged with 2025-06 missing: the window is 2025-03..2026-02,
+    # eleven months present, not the last twelve months that happen to exist.
+    months = {
+        f"{year}-{month:02d}": {"North": [10.0, 1]}
+        for year, month in [(2025, m) for m in range(1, 13)] + [(2026, 1), (2026, 2)]
+        if (year, month) != (2025, 6)
+    }
+    actual, as_of = actual_value(months, "ttm_sum")
+    assert actual == pytest.approx(110.0 / 11 * 12)
+    assert as_of == "2025-03 to 2026-02 (11 mo annualized)"
+
+    months["2025-06"] = {"North": [10.0, 1]}
+    assert actual_value(months, "ttm_sum") == (pytest.approx(120.0), "2025-03 to 2026-02")
+
+def test_dashboard_rows_report_each_kpi_as_of_its_own_month(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + (
+        "2026-01,North,bid_win_rate,35\n"
+        "2026-01,South,bid_win_rate,35\n"
+        "2026-01,North,safety_incident_rate,2.5\n"
+        "2026-02,North,bid_win_rate,20\n"
+        "2026-02,North,gross_margin,36\n"
+    ))
+    state = empty_state()
+    ingest([log], state)
+    dashboard = dashboard_rows(state)
+    rows = {row[0]: row for row in dashboard["financial_kpis"] + dashboard["operational_kpis"]}
+
+    assert rows["Bid Win Rate"][3:5] == ("35.0%", "2026-01")
+    assert rows["Bid Win Rate"][6] == "Exceeds"
+    assert rows["Safety Incident Rate"][4] == "2026-01"
+    assert rows["Gross Margin"][4] == "2026-02"
+    assert rows["Operating Margin"][3:] == ("—", "—", "—", "No Data")
+
+def test_dashboard_rows_for_one_branch(tmp_path):
+    log = tmp_path / "actuals.csv"
+    write(log, HEADER + (
+        "2026-01,North,bid_win_rate,40\n"
+        "2026-01,South Coast,bid_win_rate,30\n"
+        "2026-02,North,bid_win_rate,20\n"
+    ))
+    state = empty_state()
+    ingest([log], state)
+    assert branches(state) == ["North", "South Coast"]
+
+    def bid_win_rate(branch=None):
+        dashboard = dashboard_rows(state, branch=branch)
+        return next(row for row in dashboard["operational_kpis"] if row[0] == "Bid Win Rate")[3:5]
+
+    # South has not reported February, so the combined dashboard stays on January
+    assert bid_win_rate() == ("35.0%", "2026-01")
+    assert bid_win_rate("North") == ("20.0%", "2026-02")
+    assert bid_win_rate("South Coast") == ("30.0%", "2026-01")
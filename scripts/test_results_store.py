@@ -0,0 +1,119 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+import results_store
+from results_store import AGGREGATES, ResultsStore
+
+def metrics(npv, irr=2156):
+    return [
+        ("Total Annual Benefit", 111.9, "M"),
+        ("5-Year NPV (10% WACC)", npv, "M"),
+        ("Internal Rate of Return", irr, "%"),
+        ("Not A Run Metric", 1.0, ""),
+    ]
+
+def use_cases(*benefits):
+    return {
+        "P0": [{"name": "Lead Scoring", "benefit": benefits[0]}, {"name": "Nurture", "benefit": benefits[1]}],
+        "P1": [{"name": "Takeoffs", "benefit": benefits[2]}],
+    }
+
+# 2026-01-15, 2026-02-15 and 2026-03-15 UTC
+JAN, FEB, MAR = 1768435200, 1771113600, 1773532800
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(tmp_path)
+    store.append_run("Acme", metrics(400.0), use_cases(10.0, 5.0, 20.0), timestamp=JAN)
+    store.append_run("Beta", metrics(420.0), use_cases(12.0, 6.0, 18.0), timestamp=JAN + 3600)
+    store.append_run("Acme", metrics(440.0, irr=2000), use_cases(11.0, 4.0, 25.0), timestamp=FEB)
+    store.append_run("Beta", metrics(380.0), use_cases(9.0, 7.0, 30.0), timestamp=MAR)
+    return store
+
+def groupby(rows, key, value, agg):
+    # Plain-Python reference for ResultsStore.aggregate
+    groups = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row[value])
+    reduce = {"sum": sum, "mean": lambda v: sum(v) / len(v), "min": min, "max": max, "count": len}[agg]
+    return sorted((group, float(reduce(values))) for group, values in groups.items())
+
+def use_case_rows(store):
+    columns = store.select("use_cases")
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+def test_runs_survive_reopen(store, tmp_path):
+    reopened = ResultsStore(tmp_path)
+    runs = reopened.select("runs")
+    assert runs["run_id"].tolist() == [1, 2, 3, 4]
+    assert runs["client"].tolist() == ["Acme", "Beta", "Acme", "Beta"]
+    assert runs["npv"].tolist() == [400.0, 420.0, 440.0, 380.0]
+    # Metrics missing from the Executive Summary list are recorded as NaN
+    assert np.isnan(runs["investment"]).all()
+    assert reopened.append_run("Gamma", metrics(1.0), use_cases(1.0, 1.0, 1.0)) == 5
+    assert len(reopened.column("use_cases", "benefit")) == 15
+
+def test_uncommitted_tail_is_trimmed_by_next_append(store, tmp_path):
+    # Simulate a writer that died after writing column bytes but before meta.json
+    for name, dtype in results_store.SCHEMAS["runs"]:
+        with open(tmp_path / "runs" / f"{name}.bin", "ab") as f:
+            f.write(np.zeros(3, dtype=dtype).tobytes())
+    reopened = ResultsStore(tmp_path)
+    assert len(reopened.column("runs", "run_id")) == 4
+
+    reopened.append_run("Gamma", metrics(500.0), use_cases(1.0, 1.0, 1.0))
+    runs = ResultsStore(tmp_path).select("runs")
+    assert runs["run_id"].tolist() == [1, 2, 3, 4, 5]
+    assert runs["npv"].tolist()[-1] == 500.0
+    assert (tmp_path / "runs" / "npv.bin").stat().st_size == 5 * 8
+
+@pytest.mark.parametrize("dense", [True, False])
+@pytest.mark.parametrize("agg", AGGREGATES)
+def test_aggregate_matches_plain_groupby(store, monkeypatch, agg, dense):
+    if not dense:
+        monkeypatch.setattr(results_store, "DENSE_GROUP_LIMIT", 0)
+    rows = use_case_rows(store)
+
+    by_client_platform = store.aggregate("use_cases", "benefit", by=("client", "platform"), agg=agg)
+    assert by_client_platform == pytest.approx(
+        groupby(rows, lambda row: (row["client"], row["platform"]), "benefit", agg))
+
+    acme = store.aggregate("use_cases", "benefit", by=("use_case",), agg=agg, client="Acme")
+    expected = groupby([row for row in rows if row["client"] == "Acme"], lambda row: (row["use_case"],), "benefit", agg)
+    assert acme == pytest.approx(expected)
+
+    assert store.aggregate("use_cases", "benefit", agg=agg) == pytest.approx(
+        groupby(rows, lambda row: (), "benefit", agg))
+
+def test_trend_groups_by_calendar_period(store):
+    assert store.trend("npv", freq="M") == [
+        (("2026-01", "Acme"), 400.0),
+        (("2026-01", "Beta"), 420.0),
+        (("2026-02", "Acme"), 440.0),
+        (("2026-03", "Beta"), 380.0),
+    ]
+    assert store.trend("irr", freq="Y", client="Acme", agg="min") == [(("2026", "Acme"), 2000.0)]
+    assert store.trend("npv", start="2026-02-01", end="2026-03-01") == [(("2026-02", "Acme"), 440.0)]
+
+def test_unknown_client_and_empty_range_return_nothing(store):
+    assert store.aggregate("runs", "npv", by=("client",), client="Nobody") == []
+    assert store.aggregate("runs", "npv", client="Nobody") == []
+    assert store.aggregate("use_cases", "benefit", by=("platform",), start="2030-01-01") == []
+    assert store.select("runs", columns=["run_id"], client="Nobody")["run_id"].tolist() == []
+
+def test_empty_store_queries(tmp_path):
+    store = ResultsStore(tmp_path)
+    assert store.aggregate("runs", "npv", by=("client",)) == []
+    assert store.trend("npv") == []
+
+@pytest.mark.parametrize("call, message", [
+    (lambda store: store.select("nope"), "Unknown table"),
+    (lambda store: store.aggregate("runs", "benefit"), "no 'benefit' column"),
+    (lambda store: store.aggregate("runs", "npv", platform="P0"), "no 'platform' column"),
+    (lambda store: store.aggregate("runs", "npv", agg="median"), "agg must be one of"),
+])
+def test_bad_queries_raise_value_error(store, call, message):
+    with pytest.raises(ValueError, match=message):
+        call(store)